@@ -0,0 +1,191 @@
+"""Benchmark the loaders and the metrics on synthetic data."""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from orphanet_translation import loader
+from orphanet_translation.metrics import coverage, scorer, synonyms
+
+import synthetic
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _get_commit():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _time_function(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _get_benchmarks(data_folder, data, lang_list, metric_list, output_dir):
+    """Get the functions to benchmark, with the number of rows processed.
+
+    The loaders only read the generated languages, and the external
+    references of Orphanet are only loaded when English is generated, as
+    they are read from its file.
+    """
+    full_data_df = pd.read_json(os.path.join(data_folder,
+                                             'full_data_df.json'))
+    full_data_df.loc[:, 'value_property'] = \
+        full_data_df['value_property'].astype(str)
+    wikidata_df = full_data_df.applymap(loader._empty_elem_wikidata)
+
+    result_df = pd.merge(data['ordo_df'], data['wikidata_df'],
+                         left_index=True, right_index=True)
+
+    benchmarks = {
+        'load_ordo_data': (
+            lambda: loader.load_ordo_data(data_folder, lang_list),
+            len(data['ordo_df'])),
+        'load_wikidata_data': (
+            lambda: loader.load_wikidata_data(data_folder, lang_list),
+            len(data['wikidata_df'])),
+        'load_gct_data': (lambda: loader.load_gct_data(data_folder),
+                          len(data['gct_df'])),
+        'load_external_onto_wikidata_data': (
+            lambda: loader.load_external_onto_wikidata_data(data_folder),
+            len(data['second_order_df'])),
+        '_merge_same_ordo_id': (
+            lambda: loader._merge_same_ordo_id(wikidata_df),
+            len(wikidata_df)),
+        'count_synonyms': (
+            lambda: synonyms.count_synonyms(result_df, output_dir),
+            len(result_df)),
+        'compute_coverage': (
+            lambda: coverage.compute_coverage(data['ordo_df'], result_df,
+                                              output_dir),
+            len(result_df)),
+    }
+    if 'en' in lang_list:
+        benchmarks['load_ordo_external_references'] = (
+            lambda: loader.load_ordo_external_references(data_folder),
+            len(data['ordo_df']))
+    for metric in metric_list:
+        scorer_tool = scorer.Scorer([metric])
+        benchmarks['Scorer.score.'+metric] = (
+            lambda scorer_tool=scorer_tool: scorer_tool.score(
+                result_df.copy(), output_dir=output_dir),
+            len(result_df))
+    return benchmarks
+
+
+def main(scale_list, metric_list, output_file, repeat=3, lang_list=None,
+         synonym_distribution='poisson', mean_synonyms=1.5, seed=0):
+    """Run the benchmarks and write the timings in a JSON file.
+
+    Args:
+        scale_list (list): sizes of the synthetic data, as multiples of the
+            size of Orphanet.
+        metric_list (list): metrics of textdistance benchmarked in Scorer.
+        output_file (str): path of the JSON file with the results.
+        repeat (int, optional): number of runs of each benchmark.
+            Defaults to 3.
+        lang_list (list, optional): the two letters name of the languages.
+            Defaults to the languages of Orphanet.
+        synonym_distribution (str, optional): distribution of the number of
+            synonyms per entity. Defaults to 'poisson'.
+        mean_synonyms (float, optional): mean number of synonyms per entity.
+            Defaults to 1.5.
+        seed (int, optional): seed of the generator. Defaults to 0.
+
+    """
+    if lang_list is None:
+        lang_list = synthetic.LANG_LIST
+
+    report = {
+        'commit': _get_commit(),
+        'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'repeat': repeat,
+        'lang_list': lang_list,
+        'synonym_distribution': synonym_distribution,
+        'mean_synonyms': mean_synonyms,
+        'results': []
+    }
+
+    for scale in scale_list:
+        nb_entities = int(scale * synthetic.ORPHANET_SIZE)
+        with tempfile.TemporaryDirectory() as tmp_folder:
+            data_folder = os.path.join(tmp_folder, 'data')
+            output_dir = os.path.join(tmp_folder, 'results')
+            os.mkdir(output_dir)
+
+            logger.info(f'Generate synthetic data with {nb_entities} '
+                        + 'entities.')
+            data = synthetic.generate_data_folder(
+                data_folder, nb_entities, lang_list, synonym_distribution,
+                mean_synonyms, seed)
+
+            benchmarks = _get_benchmarks(data_folder, data, lang_list,
+                                         metric_list, output_dir)
+            for name, (function, nb_rows) in benchmarks.items():
+                logger.info(f'Benchmark {name} at scale {scale}.')
+                times = _time_function(function, repeat)
+                report['results'].append({
+                    'benchmark': name,
+                    'scale': scale,
+                    'nb_entities': nb_entities,
+                    'nb_rows': nb_rows,
+                    'times': times,
+                    'min': min(times),
+                    'median': float(np.median(times)),
+                    'rows_per_second': nb_rows / min(times)
+                })
+
+    with open(output_file, 'wt') as json_file:
+        json.dump(report, json_file, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description='Benchmark Orphanet translation on synthetic data'
+    )
+    parser.add_argument('--scales', nargs='+', type=float, default=[1],
+                        help='Sizes of the synthetic data, as multiples of'
+                        + ' the size of Orphanet (from 1 to 100).')
+    parser.add_argument('--metrics', nargs='+', default=['jaro'],
+                        help='Metrics benchmarked in Scorer.')
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='JSON file where the results will be written.')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of runs of each benchmark.')
+    parser.add_argument('--langs', nargs='+',
+                        help='Languages of the synthetic data.')
+    parser.add_argument('--synonym_distribution', default='poisson',
+                        choices=['poisson', 'geometric', 'constant'],
+                        help='Distribution of the number of synonyms.')
+    parser.add_argument('--mean_synonyms', type=float, default=1.5,
+                        help='Mean number of synonyms per entity.')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='Seed of the generator.')
+    args = parser.parse_args()
+
+    main(scale_list=args.scales, metric_list=args.metrics,
+         output_file=args.output, repeat=args.repeat, lang_list=args.langs,
+         synonym_distribution=args.synonym_distribution,
+         mean_synonyms=args.mean_synonyms, seed=args.seed)
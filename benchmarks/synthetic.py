@@ -0,0 +1,284 @@
+"""Generate synthetic data with the same format as the Orphanet data."""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+LANG_LIST = ['cs', 'de', 'en', 'es', 'fr', 'it', 'nl', 'pl', 'pt']
+
+# Approximate number of disorders in Orphanet, used as the 1x scale.
+ORPHANET_SIZE = 10000
+
+# External ontologies with a file in the data folder, read by
+# loader.load_external_onto_wikidata_data.
+ONTO_LIST = ['id_UMLS', 'id_ICD10CM', 'id_MeSH', 'id_ICD10', 'id_MedDRA',
+             'id_OMIM']
+
+SYLLABLES = ['ba', 'co', 'di', 'fe', 'gu', 'ha', 'ki', 'lo', 'ma', 'ne',
+             'pi', 'ro', 'su', 'ta', 'vi', 'xe', 'zo', 'tr', 'ph', 'st']
+
+
+def _get_vocabulary(random_state, nb_words=2000):
+    nb_syllables = random_state.randint(2, 5, size=nb_words)
+    syllables = random_state.randint(len(SYLLABLES), size=(nb_words, 4))
+    return [''.join(SYLLABLES[i] for i in row[:nb])
+            for row, nb in zip(syllables, nb_syllables)]
+
+
+def _get_labels(random_state, vocabulary, nb_labels):
+    nb_words = random_state.randint(1, 5, size=nb_labels)
+    words = random_state.randint(len(vocabulary), size=(nb_labels, 4))
+    return [' '.join(vocabulary[i] for i in row[:nb])
+            for row, nb in zip(words, nb_words)]
+
+
+def _add_noise(random_state, labels, noise):
+    """Replace one character of a fraction of the labels."""
+    noisy_labels = list(labels)
+    for i in np.flatnonzero(random_state.rand(len(labels)) < noise):
+        label = noisy_labels[i]
+        if label == '':
+            continue
+        position = random_state.randint(len(label))
+        noisy_labels[i] = label[:position] + 'e' + label[position+1:]
+    return noisy_labels
+
+
+def _get_nb_synonyms(random_state, nb_entities, synonym_distribution,
+                     mean_synonyms):
+    if synonym_distribution == 'poisson':
+        return random_state.poisson(mean_synonyms, size=nb_entities)
+    if synonym_distribution == 'geometric':
+        return random_state.geometric(1 / (1 + mean_synonyms),
+                                      size=nb_entities) - 1
+    if synonym_distribution == 'constant':
+        return np.full(nb_entities, int(round(mean_synonyms)))
+    raise ValueError(f'Unknown synonym distribution: {synonym_distribution}.')
+
+
+def _split_synonyms(synonyms, nb_synonyms):
+    bounds = np.concatenate([[0], np.cumsum(nb_synonyms)])
+    return [synonyms[start:end]
+            for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def generate_gold_labels(nb_entities, lang_list=LANG_LIST,
+                         synonym_distribution='poisson', mean_synonyms=1.5,
+                         lang_coverage=0.9, seed=0):
+    """Generate the gold labels and synonyms of synthetic Orphanet entities.
+
+    Args:
+        nb_entities (int): number of entities.
+        lang_list (list, optional): the two letters name of the languages.
+            Defaults to LANG_LIST.
+        synonym_distribution (str, optional): distribution of the number of
+            synonyms per entity, in ['poisson', 'geometric', 'constant'].
+            Defaults to 'poisson'.
+        mean_synonyms (float, optional): mean number of synonyms per entity.
+            Defaults to 1.5.
+        lang_coverage (float, optional): probability that an entity has
+            labels in a language other than English. Defaults to 0.9.
+        seed (int, optional): seed of the generator. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: the gold labels indexed by OrphaNumber, with the same
+            columns as loader.load_ordo_data.
+
+    """
+    random_state = np.random.RandomState(seed)
+    orpha_numbers = np.sort(random_state.choice(
+        np.arange(1, 10 * nb_entities + 1), size=nb_entities, replace=False))
+    ordo_df = pd.DataFrame(index=orpha_numbers.astype(str))
+    ordo_df.index.name = 'OrphaNumber'
+
+    for lang in lang_list:
+        lang_cap = lang.capitalize()
+        vocabulary = _get_vocabulary(random_state)
+        nb_synonyms = _get_nb_synonyms(random_state, nb_entities,
+                                       synonym_distribution, mean_synonyms)
+        labels = _get_labels(random_state, vocabulary, nb_entities)
+        synonyms = _get_labels(random_state, vocabulary, nb_synonyms.sum())
+        alt_labels = ['|'.join(elem)
+                      for elem in _split_synonyms(synonyms, nb_synonyms)]
+        if lang != 'en':
+            missing = random_state.rand(nb_entities) >= lang_coverage
+            labels = ['' if miss else label
+                      for miss, label in zip(missing, labels)]
+            alt_labels = ['' if miss else alt
+                          for miss, alt in zip(missing, alt_labels)]
+        ordo_df['goldLabel'+lang_cap] = labels
+        ordo_df['goldAlt'+lang_cap] = alt_labels
+    return ordo_df
+
+
+def generate_translations(ordo_df, lang_list=LANG_LIST, coverage=0.6,
+                          noise=0.3, seed=0):
+    """Generate translations by adding noise to the gold labels.
+
+    Args:
+        ordo_df (pd.DataFrame): the gold labels from generate_gold_labels.
+        lang_list (list, optional): the two letters name of the languages.
+            Defaults to LANG_LIST.
+        coverage (float, optional): probability that an entity with a gold
+            label in a language has a translation. Defaults to 0.6.
+        noise (float, optional): probability that a translated label differs
+            from the gold one. Defaults to 0.3.
+        seed (int, optional): seed of the generator. Defaults to 0.
+
+    Returns:
+        pd.DataFrame: the translations indexed by OrphaNumber, with the
+            columns ['labelLang', 'altLang'] for each language.
+
+    """
+    random_state = np.random.RandomState(seed)
+    translation_df = pd.DataFrame(index=ordo_df.index)
+    for lang in lang_list:
+        lang_cap = lang.capitalize()
+        covered = (random_state.rand(len(ordo_df)) < coverage) \
+            & (ordo_df['goldLabel'+lang_cap] != '').to_numpy()
+        labels = _add_noise(random_state, ordo_df['goldLabel'+lang_cap],
+                            noise)
+        alt_labels = ['|'.join(_add_noise(random_state, alt.split('|'), noise))
+                      for alt in ordo_df['goldAlt'+lang_cap]]
+        translation_df['label'+lang_cap] = \
+            np.where(covered, labels, '')
+        translation_df['alt'+lang_cap] = \
+            np.where(covered, alt_labels, '')
+    return translation_df
+
+
+def _get_product1(ordo_df, lang, random_state):
+    lang_cap = lang.capitalize()
+    disorders = []
+    for orpha_number, label, alt in zip(ordo_df.index,
+                                        ordo_df['goldLabel'+lang_cap],
+                                        ordo_df['goldAlt'+lang_cap]):
+        if label == '':
+            continue
+        synonyms = [{'label': synonym} for synonym in alt.split('|')
+                    if synonym != '']
+        nb_refs = random_state.randint(3)
+        references = [{'id': str(random_state.randint(10**6)),
+                       'Source': ['OMIM', 'UMLS', 'MeSH', 'ICD-10'][i],
+                       'Reference': str(random_state.randint(10**6))}
+                      for i in range(nb_refs)]
+        disorder = {
+            'OrphaNumber': orpha_number,
+            'Name': [{'label': label}],
+            'SynonymList': [{'count': str(len(synonyms)),
+                             'Synonym': synonyms}],
+            'ExternalReferenceList': [{'count': str(nb_refs),
+                                       'ExternalReference': references}]
+        }
+        disorders.append(disorder)
+    return {'JDBOR': [{'DisorderList': [{'count': str(len(disorders)),
+                                         'Disorder': disorders}]}]}
+
+
+def _get_query_ordo(translation_df, wikidata_ids, lang):
+    lang_cap = lang.capitalize()
+    lang_df = translation_df[translation_df['label'+lang_cap] != '']
+    bindings = [{'disease': {'value': wikidata_ids[orpha_number]},
+                 'id_ordo': {'value': orpha_number},
+                 'label'+lang_cap: {'value': label},
+                 'alt'+lang_cap: {'value': alt}}
+                for orpha_number, label, alt in zip(
+                    lang_df.index, lang_df['label'+lang_cap],
+                    lang_df['alt'+lang_cap])]
+    return {'results': {'bindings': bindings}}
+
+
+def _get_second_order(translation_df, lang_list, random_state,
+                      second_order=0.4):
+    """Get Wikidata items with labels, and their ids in each ontology."""
+    lang_caps = [lang.capitalize() for lang in lang_list]
+    translated = np.any([translation_df['label'+lang_cap] != ''
+                         for lang_cap in lang_caps], axis=0)
+    selected = translated \
+        & (random_state.rand(len(translation_df)) < second_order)
+    second_order_df = translation_df[selected].reset_index(drop=True)
+    second_order_df.insert(
+        0, 'disease', [f'http://www.wikidata.org/entity/Q{10**7 + i}'
+                       for i in range(len(second_order_df))])
+
+    onto_dict = {}
+    for id_onto in ONTO_LIST:
+        linked = random_state.rand(len(second_order_df)) < 0.5
+        onto_dict[id_onto] = pd.DataFrame({
+            'disease': second_order_df['disease'][linked].to_numpy(),
+            id_onto: [str(reference) for reference in
+                      random_state.randint(10**6, size=linked.sum())]
+        })
+    return second_order_df, onto_dict
+
+
+def generate_data_folder(data_folder, nb_entities, lang_list=LANG_LIST,
+                         synonym_distribution='poisson', mean_synonyms=1.5,
+                         seed=0):
+    """Write a synthetic data folder readable by the loader functions.
+
+    The folder contains the files lang_product1.json,
+    lang_query_ordo.json, full_data_df.json, gct_translation.json,
+    second_order_disease.json and one id_Ontology.json file per external
+    ontology. Only the languages of lang_list are written, the loaders
+    reading all the languages have to be given the same list.
+
+    Args:
+        data_folder (str): folder where the files will be written.
+        nb_entities (int): number of Orphanet entities.
+        lang_list (list, optional): the two letters name of the languages.
+            Defaults to LANG_LIST.
+        synonym_distribution (str, optional): distribution of the number of
+            synonyms per entity, in ['poisson', 'geometric', 'constant'].
+            Defaults to 'poisson'.
+        mean_synonyms (float, optional): mean number of synonyms per entity.
+            Defaults to 1.5.
+        seed (int, optional): seed of the generator. Defaults to 0.
+
+    Returns:
+        dict: the DataFrames 'ordo_df', 'wikidata_df', 'gct_df' and
+            'second_order_df' written in the folder.
+
+    """
+    if not os.path.exists(data_folder):
+        os.makedirs(data_folder)
+
+    random_state = np.random.RandomState(seed)
+    ordo_df = generate_gold_labels(nb_entities, lang_list,
+                                   synonym_distribution, mean_synonyms,
+                                   seed=seed)
+    wikidata_df = generate_translations(ordo_df, lang_list, seed=seed+1)
+    gct_df = generate_translations(ordo_df, lang_list, coverage=1,
+                                   seed=seed+2)
+    gct_df = gct_df.drop(['labelEn', 'altEn'], axis=1, errors='ignore')
+    wikidata_ids = {orpha_number: f'http://www.wikidata.org/entity/Q{i}'
+                    for i, orpha_number in enumerate(ordo_df.index)}
+
+    for lang in lang_list:
+        path = os.path.join(data_folder, lang+'_product1.json')
+        with open(path, 'wt', encoding='utf-8') as json_file:
+            json_file.write(
+                json.dumps(_get_product1(ordo_df, lang, random_state)))
+        path = os.path.join(data_folder, lang+'_query_ordo.json')
+        with open(path, 'wt', encoding='utf-8') as json_file:
+            json_file.write(
+                json.dumps(_get_query_ordo(wikidata_df, wikidata_ids, lang)))
+
+    full_data_df = wikidata_df.reset_index()
+    full_data_df = full_data_df.rename(
+        columns={'OrphaNumber': 'value_property'})
+    full_data_df['source_degree'] = np.where(
+        random_state.rand(len(full_data_df)) < 0.7, 'First', 'Second')
+    full_data_df.to_json(os.path.join(data_folder, 'full_data_df.json'))
+    gct_df.to_json(os.path.join(data_folder, 'gct_translation.json'))
+
+    second_order_df, onto_dict = _get_second_order(wikidata_df, lang_list,
+                                                   random_state)
+    second_order_df.to_json(os.path.join(data_folder,
+                                         'second_order_disease.json'))
+    for id_onto, onto_df in onto_dict.items():
+        onto_df.to_json(os.path.join(data_folder, id_onto+'.json'))
+
+    return {'ordo_df': ordo_df, 'wikidata_df': wikidata_df, 'gct_df': gct_df,
+            'second_order_df': second_order_df}
@@ -1,14 +1,14 @@
 """Main function to compue the results."""
 import argparse
+import cProfile
 import json
 import logging
 import os
 
 import numpy as np
 import pandas as pd
-from wikidata_property_extraction import translation, header, second_order
 
-from orphanet_translation import loader
+from orphanet_translation import instrumentation, loader, normalization
 from orphanet_translation.metrics import coverage, scorer, synonyms
 
 LANG_LIST = ['en', 'fr', 'de', 'es', 'pl', 'it', 'pt', 'nl', 'cs']
@@ -25,6 +25,9 @@ def _load_from_file(data_folder):
 
 
 def _load_from_wikidata_query(data_folder, user_agent, result_folder):
+    # Only needed with --recompute, imported here to keep the start fast.
+    from wikidata_property_extraction import header, second_order
+
     header.initialize_user_agent(user_agent)
 
     xref_onto_df = loader.load_ordo_external_references(data_folder)
@@ -45,29 +48,68 @@ def _load_from_wikidata_query(data_folder, user_agent, result_folder):
     return full_data_df
 
 
-def _compute_all_results(full_onto_df, result_df, metric_list, results_folder):
+def _merge_wikidata(wikidata_df, run_report, comparison):
+    with run_report.stage('empty_elem_wikidata', comparison=comparison) \
+            as stage:
+        wikidata_df = wikidata_df.applymap(loader._empty_elem_wikidata)
+        stage['rows'] = len(wikidata_df)
+
+    with run_report.stage('merge_same_ordo_id', comparison=comparison) \
+            as stage:
+        stage['rows'] = len(wikidata_df)
+        wikidata_df = loader._merge_same_ordo_id(wikidata_df)
+    return wikidata_df
+
+
+def _compute_all_results(full_onto_df, result_df, metric_list, results_folder,
+                         ci_width=None, run_report=None,
+                         normalization_cache=None):
+    if run_report is None:
+        run_report = instrumentation.RunReport()
+    comparison = os.path.basename(results_folder)
+
     if not os.path.exists(results_folder):
         os.mkdir(results_folder)
 
-    scoring = scorer.Scorer(metric_list)
+    normalized = normalization_cache is not None
+    if normalized:
+        logger.info('Start normalizing labels.')
+        with run_report.stage('normalize', comparison=comparison) as stage:
+            normalization.add_normalized_columns(result_df,
+                                                 normalization_cache)
+            stage['rows'] = len(result_df)
+
+    scoring = scorer.Scorer(metric_list, run_report=run_report,
+                            normalized=normalized)
     logger.info('Start computing coverage.')
     # Compute the coverage
-    coverage.compute_coverage(full_onto_df, result_df, results_folder)
+    with run_report.stage('compute_coverage', comparison=comparison) as stage:
+        coverage.compute_coverage(full_onto_df, result_df, results_folder)
+        stage['rows'] = len(result_df)
 
     logger.info('Start computing number of labels.')
 
     # Compute the average number of labels by Orphanet entity in function of
     # the language
-    synonyms.count_synonyms(result_df, results_folder)
-
-    logger.info('Start computing quality scores.')
+    with run_report.stage('count_synonyms', comparison=comparison) as stage:
+        synonyms.count_synonyms(result_df, results_folder)
+        stage['rows'] = len(result_df)
 
     # Compute the quality score
-    scoring.score(result_df, output_dir=results_folder)
+    with run_report.stage('quality_scores', comparison=comparison) as stage:
+        if ci_width is None:
+            logger.info('Start computing quality scores.')
+            scoring.score(result_df, output_dir=results_folder)
+        else:
+            logger.info('Start estimating quality scores.')
+            scoring.estimate(result_df, output_dir=results_folder,
+                             ci_width=ci_width)
+        stage['rows'] = len(result_df)
 
 
 def main(data_folder, metric_list, results_folder, user_agent,
-         recompute=False, no_gct=False):
+         recompute=False, no_gct=False, ci_width=None, profile=False,
+         normalize=False):
     """Get the data and compute the results.
 
     Args:
@@ -80,27 +122,50 @@ def main(data_folder, metric_list, results_folder, user_agent,
             false, from files. Defaults to False.
         no_gct (bool, optional): Flag to specify if translation from Google
             Cloud translation are available.
+        ci_width (float, optional): if specified, the quality scores are
+            estimated on a sample of the entities, until their confidence
+            intervals are narrower than ci_width. Defaults to None.
+        profile (bool, optional): Flag to profile the run with cProfile, the
+            statistics are written in profile.prof in results_folder.
+            Defaults to False.
+        normalize (bool, optional): Flag to score the labels without case,
+            accents and punctuation. Defaults to False.
 
     """
+    run_report = instrumentation.RunReport()
+    # Shared between the comparisons to normalize each label only once
+    normalization_cache = {} if normalize else None
+    if profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
     # Load gold label from Ordo dataset
     logger.info('Load ordo data from file.')
-    ordo_df = loader.load_ordo_data(data_folder)
+    with run_report.stage('load_ordo_data') as stage:
+        ordo_df = loader.load_ordo_data(data_folder)
+        stage['rows'] = len(ordo_df)
 
     # Load the Wikidata data
     if recompute:
         logger.info('Starting to query Wikidata.')
-        full_data_df = _load_from_wikidata_query(data_folder, user_agent,
-                                                 results_folder)
+        with run_report.stage('load_from_wikidata_query') as stage:
+            full_data_df = _load_from_wikidata_query(data_folder, user_agent,
+                                                     results_folder)
+            stage['rows'] = len(full_data_df)
     else:
         logger.info('Load Wikidata data from file.')
-        full_data_df = _load_from_file(data_folder)
+        with run_report.stage('load_from_file') as stage:
+            full_data_df = _load_from_file(data_folder)
+            stage['rows'] = len(full_data_df)
 
     full_data_df.loc[:, 'value_property'] = \
         full_data_df['value_property'].astype(str)
 
     # Load the data obtained with Google Cloud Translation
     logger.info('Load Google Cloud Translation data from file.')
-    gct_translation_df = loader.load_gct_data(data_folder)
+    with run_report.stage('load_gct_data') as stage:
+        gct_translation_df = loader.load_gct_data(data_folder)
+        stage['rows'] = len(gct_translation_df)
 
     # Create the result folder it does not exist yet
     if not os.path.exists(results_folder):
@@ -110,8 +175,8 @@ def main(data_folder, metric_list, results_folder, user_agent,
     # Merge data obtained through first_order links and gold data
     first_order_df = \
         full_data_df[full_data_df['source_degree'] == 'First']
-    first_order_df = first_order_df.applymap(loader._empty_elem_wikidata)
-    first_order_df = loader._merge_same_ordo_id(first_order_df)
+    first_order_df = _merge_wikidata(first_order_df, run_report,
+                                     'wikidata_first_only')
 
     xref_wiki_ordo_1st_df = pd.merge(ordo_df, first_order_df, left_index=True,
                                      right_on='value_property')
@@ -119,14 +184,16 @@ def main(data_folder, metric_list, results_folder, user_agent,
     xref_wiki_ordo_1st_df.fillna('', inplace=True)
 
     _compute_all_results(ordo_df, xref_wiki_ordo_1st_df, metric_list,
-                         os.path.join(results_folder, 'wikidata_first_only'))
+                         os.path.join(results_folder, 'wikidata_first_only'),
+                         ci_width=ci_width, run_report=run_report,
+                         normalization_cache=normalization_cache)
 
     logger.info('Second-order')
     # Merge data obtained through second_order links and gold data
     second_only_df = \
         full_data_df[full_data_df['source_degree'] == 'Second']
-    second_only_df = second_only_df.applymap(loader._empty_elem_wikidata)
-    second_only_df = loader._merge_same_ordo_id(second_only_df)
+    second_only_df = _merge_wikidata(second_only_df, run_report,
+                                     'wikidata_second_only')
 
     xref_wiki_ordo_2nd_df = pd.merge(ordo_df, second_only_df, left_index=True,
                                      right_on='value_property', how='inner')
@@ -134,12 +201,14 @@ def main(data_folder, metric_list, results_folder, user_agent,
     xref_wiki_ordo_2nd_df.fillna('', inplace=True)
 
     _compute_all_results(ordo_df, xref_wiki_ordo_2nd_df, metric_list,
-                         os.path.join(results_folder, 'wikidata_second_only'))
+                         os.path.join(results_folder, 'wikidata_second_only'),
+                         ci_width=ci_width, run_report=run_report,
+                         normalization_cache=normalization_cache)
 
     logger.info('First- and second-order')
     # Merge data obtained through first- and second-order links and gold data
-    first_second_wiki_df = full_data_df.applymap(loader._empty_elem_wikidata)
-    first_second_wiki_df = loader._merge_same_ordo_id(first_second_wiki_df)
+    first_second_wiki_df = _merge_wikidata(full_data_df, run_report,
+                                           'wikidata_full')
 
     xref_wiki_ordo_1st_2nd_df = pd.merge(ordo_df, first_second_wiki_df,
                                          left_index=True,
@@ -149,7 +218,9 @@ def main(data_folder, metric_list, results_folder, user_agent,
     xref_wiki_ordo_1st_2nd_df.fillna('', inplace=True)
 
     _compute_all_results(ordo_df, xref_wiki_ordo_1st_2nd_df, metric_list,
-                         os.path.join(results_folder, 'wikidata_full'))
+                         os.path.join(results_folder, 'wikidata_full'),
+                         ci_width=ci_width, run_report=run_report,
+                         normalization_cache=normalization_cache)
 
     if not no_gct:
         logger.info('Google Cloud Translation')
@@ -165,7 +236,15 @@ def main(data_folder, metric_list, results_folder, user_agent,
         xref_gct_ordo_df.fillna('', inplace=True)
 
         _compute_all_results(ordo_df, xref_gct_ordo_df, metric_list,
-                             os.path.join(results_folder, 'gct'))
+                             os.path.join(results_folder, 'gct'),
+                             ci_width=ci_width, run_report=run_report,
+                             normalization_cache=normalization_cache)
+
+    if profile:
+        profiler.disable()
+        profiler.dump_stats(os.path.join(results_folder, 'profile.prof'))
+
+    run_report.write(os.path.join(results_folder, 'run_report.json'))
 
 
 if __name__ == "__main__":
@@ -176,7 +255,8 @@ if __name__ == "__main__":
                         help='Folder with the required files.')
     parser.add_argument('--result_folder',
                         help='Folder where the results will be written.')
-    parser.add_argument('--metrics', nargs='+',
+    parser.add_argument('--metrics', nargs='+', required=True,
+                        choices=scorer.TEXTDISTANCE_FUNCTIONS,
                         help='Metrics used for the quality score.')
     parser.add_argument('--recompute', action='store_true',
                         help='Flag to query Wikidata instead '
@@ -184,6 +264,15 @@ if __name__ == "__main__":
     parser.add_argument('--no_gct', action='store_true',
                         help='Flag to specify if translation from Google Cloud'
                         + ' Translation are available.')
+    parser.add_argument('--progressive', type=float, metavar='CI_WIDTH',
+                        help='Estimate the quality scores on a sample of the'
+                        + ' entities until the width of the confidence'
+                        + ' intervals is under CI_WIDTH.')
+    parser.add_argument('--normalize', action='store_true',
+                        help='Flag to score the labels without case, accents'
+                        + ' and punctuation.')
+    parser.add_argument('--profile', action='store_true',
+                        help='Flag to profile the run with cProfile.')
     parser.add_argument('--user_agent',
                         help='Specify a user_agent to query Wikidata.',
                         default='')
@@ -196,4 +285,5 @@ if __name__ == "__main__":
 
     main(data_folder=args.data_folder, metric_list=args.metrics,
          results_folder=args.result_folder, recompute=args.recompute,
-         user_agent=args.user_agent)
+         user_agent=args.user_agent, ci_width=args.progressive,
+         profile=args.profile, normalize=args.normalize)
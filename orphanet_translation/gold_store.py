@@ -0,0 +1,183 @@
+"""Memory-mapped store of the gold labels of Orphanet.
+
+The store is a flat file which can be shared by several processes without
+copying the DataFrame of the gold labels in each of them. It contains:
+    - a JSON header with the columns and the sizes of the arrays,
+    - a lookup array giving the row of each OrphaNumber,
+    - the OrphaNumbers of the rows,
+    - the offsets of each (row, column) cell in the string buffer,
+    - the string buffer, with all the cells encoded in UTF-8.
+"""
+import json
+import mmap
+import struct
+
+import numpy as np
+
+MAGIC = b'OGLS0001'
+_HEADER_SIZE = struct.Struct('<Q')
+
+
+def _align(position):
+    return position + (-position % 8)
+
+
+def write_gold_store(ordo_df, path):
+    """Write the gold labels in a memory-mappable file.
+
+    Args:
+        ordo_df (pd.DataFrame): DataFrame with the gold labels indexed by
+            OrphaNumber, as returned by loader.load_ordo_data.
+        path (str): path of the file.
+
+    """
+    columns = [column for column in ordo_df.columns
+               if 'goldLabel' in column[:9] or 'goldAlt' in column[:7]]
+    orpha_numbers = np.array([int(orpha_number)
+                              for orpha_number in ordo_df.index],
+                             dtype=np.int64)
+    if len(orpha_numbers) and orpha_numbers.min() < 0:
+        raise ValueError('OrphaNumbers have to be positive integers.')
+
+    cells = [cell.encode('utf-8') if isinstance(cell, str) else b''
+             for cell in ordo_df[columns].to_numpy().ravel()]
+    offsets = np.zeros(len(cells) + 1, dtype=np.int64)
+    np.cumsum([len(cell) for cell in cells], out=offsets[1:])
+
+    max_orpha_number = int(orpha_numbers.max()) if len(orpha_numbers) else -1
+    lookup = np.full(max_orpha_number + 1, -1, dtype=np.int32)
+    lookup[orpha_numbers] = np.arange(len(orpha_numbers), dtype=np.int32)
+
+    header = json.dumps({'columns': columns,
+                         'nb_rows': len(orpha_numbers),
+                         'lookup_size': len(lookup),
+                         'buffer_size': int(offsets[-1])}).encode('utf-8')
+
+    with open(path, 'wb') as store_file:
+        store_file.write(MAGIC)
+        store_file.write(_HEADER_SIZE.pack(len(header)))
+        store_file.write(header)
+        for array in [lookup, orpha_numbers, offsets]:
+            store_file.write(b'\0' * (-store_file.tell() % 8))
+            store_file.write(array.tobytes())
+        store_file.write(b''.join(cells))
+
+
+class GoldLabelStore():
+    """Read-only access to a file written by write_gold_store.
+
+    The file is memory-mapped, so the processes opening the same file share
+    its pages. The store is pickled as its path, a worker receiving it maps
+    the file again instead of copying the labels.
+    """
+
+    def __init__(self, path):
+        """Initialize GoldLabelStore.
+
+        Args:
+            path (str): path of the file written by write_gold_store.
+
+        """
+        self.path = path
+        with open(path, 'rb') as store_file:
+            self._mmap = mmap.mmap(store_file.fileno(), 0,
+                                   access=mmap.ACCESS_READ)
+
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f'{path} is not a gold label store.')
+        position = len(MAGIC)
+        header_size, = _HEADER_SIZE.unpack_from(self._mmap, position)
+        position += _HEADER_SIZE.size
+        header = json.loads(self._mmap[position:position+header_size])
+        position += header_size
+
+        self.columns = header['columns']
+        self._column_ids = {column: i for i, column in enumerate(self.columns)}
+        sizes = [(np.int32, header['lookup_size']),
+                 (np.int64, header['nb_rows']),
+                 (np.int64, header['nb_rows'] * len(self.columns) + 1)]
+        arrays = []
+        for dtype, size in sizes:
+            position = _align(position)
+            arrays.append(np.frombuffer(self._mmap, dtype=dtype, count=size,
+                                        offset=position))
+            position += size * np.dtype(dtype).itemsize
+        self._lookup, self._orpha_numbers, self._offsets = arrays
+        self._buffer_start = position
+
+    def __getstate__(self):
+        return {'path': self.path}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'])
+
+    @property
+    def orpha_numbers(self):
+        """np.array: a copy of the OrphaNumbers of the rows.
+
+        A copy is returned so that no view of the memory map outlives the
+        store and prevents close.
+        """
+        return self._orpha_numbers.copy()
+
+    def __len__(self):
+        return len(self._orpha_numbers)
+
+    def __contains__(self, orpha_number):
+        try:
+            orpha_number = int(orpha_number)
+        except (TypeError, ValueError):
+            return False
+        return 0 <= orpha_number < len(self._lookup) \
+            and self._lookup[orpha_number] >= 0
+
+    def get(self, orpha_number, column):
+        """Get a cell of the gold labels.
+
+        Args:
+            orpha_number (int or str): the OrphaNumber of the entity.
+            column (str): the name of the column, e.g. 'goldLabelFr'.
+
+        Returns:
+            str: the value of the cell.
+
+        """
+        if orpha_number not in self:
+            raise KeyError(orpha_number)
+        row = self._lookup[int(orpha_number)]
+        cell = row * len(self.columns) + self._column_ids[column]
+        start = self._buffer_start + self._offsets[cell]
+        end = self._buffer_start + self._offsets[cell+1]
+        return self._mmap[start:end].decode('utf-8')
+
+    def get_label(self, orpha_number, lang):
+        """Get the gold label of an entity.
+
+        Args:
+            orpha_number (int or str): the OrphaNumber of the entity.
+            lang (str): the two letters name of the language.
+
+        Returns:
+            str: the gold label, empty if there is none in the language.
+
+        """
+        return self.get(orpha_number, 'goldLabel'+lang.capitalize())
+
+    def get_alt(self, orpha_number, lang):
+        """Get the gold altLabels of an entity.
+
+        Args:
+            orpha_number (int or str): the OrphaNumber of the entity.
+            lang (str): the two letters name of the language.
+
+        Returns:
+            str: the gold altLabels separated by '|', empty if there is none
+                in the language.
+
+        """
+        return self.get(orpha_number, 'goldAlt'+lang.capitalize())
+
+    def close(self):
+        """Close the memory map of the file."""
+        self._lookup = self._orpha_numbers = self._offsets = None
+        self._mmap.close()
@@ -0,0 +1,84 @@
+"""Record the time, memory and throughput of the stages of a run."""
+import contextlib
+import json
+import sys
+import time
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, the peak memory is then not recorded.
+    resource = None
+
+
+def _get_peak_rss():
+    """Get the peak resident set size of the process since its start in MB."""
+    if resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    if sys.platform == 'darwin':
+        return peak_rss / 2**20
+    return peak_rss / 2**10
+
+
+class RunReport():
+    """Report with the measures of each stage of a run."""
+
+    def __init__(self):
+        """Initialize RunReport."""
+        self.stages = []
+
+    @contextlib.contextmanager
+    def stage(self, name, **info):
+        """Measure a stage of the run.
+
+        The wall time and the CPU time of the stage are recorded, with two
+        memory measures:
+            - peak_rss_mb: the peak resident set size of the process since
+              its start, measured at the end of the stage. It is a high-water
+              mark, so it is the same for all the stages after the one which
+              used the most memory.
+            - peak_rss_increase_mb: how much the stage raised this peak,
+              which tells which stages need more memory than the previous
+              ones.
+        The number of rows processed and of pairs of labels compared can be
+        set in the yielded dict, they are then converted in throughputs.
+
+        Args:
+            name (str): name of the stage.
+            **info: other information stored with the stage, e.g. the
+                language or the metric.
+
+        Yields:
+            dict: the record of the stage.
+
+        """
+        record = {'name': name, 'rows': None, 'pairs': None, **info}
+        peak_rss_start = _get_peak_rss()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_time'] = time.perf_counter() - wall_start
+            record['cpu_time'] = time.process_time() - cpu_start
+            record['peak_rss_mb'] = _get_peak_rss()
+            record['peak_rss_increase_mb'] = None if peak_rss_start is None \
+                else record['peak_rss_mb'] - peak_rss_start
+            for count in ['rows', 'pairs']:
+                if record[count] is not None and record['wall_time'] > 0:
+                    record[count+'_per_second'] = \
+                        record[count] / record['wall_time']
+            self.stages.append(record)
+
+    def write(self, path):
+        """Write the report in a JSON file.
+
+        Args:
+            path (str): path of the JSON file.
+
+        """
+        with open(path, 'wt') as json_file:
+            json.dump({'stages': self.stages}, json_file, indent=2,
+                      default=str)
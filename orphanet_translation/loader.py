@@ -43,19 +43,21 @@ def _merge_same_ordo_id(wikidata_df):
     return wikidata_df
 
 
-def load_wikidata_data(data_folder='data'):
+def load_wikidata_data(data_folder='data', lang_list=LANG_LIST):
     """Loader WikiData data.
 
     Args:
         data_folder (str, optional): Folder where the data is.
             Defaults to 'data'.
+        lang_list (list, optional): the two letters name of the languages
+            to load. Defaults to LANG_LIST.
 
     Returns:
         pd.DataFrame: The results in a DataFrame.
 
     """
     wiki_df = pd.DataFrame(columns=['disease', 'id_ordo'])
-    for lang in LANG_LIST:
+    for lang in lang_list:
         path = os.path.join(data_folder, lang + '_query_ordo.json')
         with open(path, encoding='utf-8') as json_file:
             json_lang = json.load(json_file)
@@ -110,12 +112,14 @@ def _get_ordo_lang(lang, data_folder):
     return syn_ordo_df
 
 
-def load_ordo_data(data_folder='data'):
+def load_ordo_data(data_folder='data', lang_list=LANG_LIST):
     """Loader ordo data.
 
     Args:
         data_folder (str, optional): Folder where the data is.
             Defaults to 'data'.
+        lang_list (list, optional): the two letters name of the languages
+            to load. Defaults to LANG_LIST.
 
     Returns:
         pd.DataFrame: The results in a DataFrame.
@@ -124,7 +128,7 @@ def load_ordo_data(data_folder='data'):
     ordo_lang_df = pd.DataFrame()
     ordo_translation = pd.DataFrame()
 
-    for lang in LANG_LIST:
+    for lang in lang_list:
         ordo_lang_df = pd.merge(ordo_lang_df,
                                 _get_ordo_lang(lang, data_folder),
                                 left_index=True, right_index=True, how='outer')
@@ -0,0 +1,203 @@
+"""Distribution of the scores of a quality metric."""
+import numpy as np
+
+BIN_EDGES = np.linspace(0, 1, 21)
+PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+
+class ScoreDistribution():
+    """Fixed-bin histogram and moments of scores, mergeable across chunks."""
+
+    def __init__(self, bin_edges=BIN_EDGES):
+        """Initialize an empty ScoreDistribution.
+
+        Args:
+            bin_edges (np.array, optional): the edges of the bins of the
+                histogram. The scores outside of them are counted in the
+                underflow and overflow. Defaults to 20 bins between 0 and 1.
+
+        """
+        self.bin_edges = np.asarray(bin_edges, dtype=float)
+        self.counts = np.zeros(len(self.bin_edges) - 1, dtype=np.int64)
+        self.underflow = 0
+        self.overflow = 0
+        self.nb_missing = 0
+        self.total = 0.
+        self.total_squares = 0.
+        self.minimum = np.inf
+        self.maximum = -np.inf
+
+    @classmethod
+    def from_scores(cls, scores, bin_edges=BIN_EDGES):
+        """Build the distribution of an array of scores.
+
+        Args:
+            scores (array-like): the scores, NaN are counted as missing.
+            bin_edges (np.array, optional): the edges of the bins of the
+                histogram. Defaults to 20 bins between 0 and 1.
+
+        Returns:
+            ScoreDistribution: the distribution of the scores.
+
+        """
+        distribution = cls(bin_edges)
+        distribution.update(scores)
+        return distribution
+
+    @property
+    def count(self):
+        """int: number of scores, without the missing ones."""
+        return int(self.counts.sum()) + self.underflow + self.overflow
+
+    def update(self, scores):
+        """Add an array of scores to the distribution.
+
+        Args:
+            scores (array-like): the scores, NaN are counted as missing.
+
+        """
+        scores = np.asarray(scores, dtype=float)
+        missing = np.isnan(scores)
+        scores = scores[~missing]
+        self.nb_missing += int(missing.sum())
+        if len(scores) == 0:
+            return
+
+        self.counts += np.histogram(scores, bins=self.bin_edges)[0]
+        self.underflow += int((scores < self.bin_edges[0]).sum())
+        self.overflow += int((scores > self.bin_edges[-1]).sum())
+        self.total += float(scores.sum())
+        self.total_squares += float(np.square(scores).sum())
+        self.minimum = min(self.minimum, float(scores.min()))
+        self.maximum = max(self.maximum, float(scores.max()))
+
+    def merge(self, other):
+        """Add the scores of another distribution to this one.
+
+        Args:
+            other (ScoreDistribution): distribution with the same bins.
+
+        Returns:
+            ScoreDistribution: self, updated.
+
+        """
+        if not np.array_equal(self.bin_edges, other.bin_edges):
+            raise ValueError('Only distributions with the same bins can be'
+                             + ' merged.')
+        self.counts += other.counts
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        self.nb_missing += other.nb_missing
+        self.total += other.total
+        self.total_squares += other.total_squares
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        return self
+
+    def mean(self):
+        """Get the mean of the scores.
+
+        Returns:
+            float: the mean, NaN if there is no score.
+
+        """
+        if self.count == 0:
+            return np.nan
+        return self.total / self.count
+
+    def std(self):
+        """Get the standard deviation of the scores.
+
+        Returns:
+            float: the standard deviation, NaN if there is no score.
+
+        """
+        if self.count == 0:
+            return np.nan
+        variance = self.total_squares / self.count - self.mean() ** 2
+        return float(np.sqrt(max(variance, 0.)))
+
+    def percentiles(self, q=PERCENTILES):
+        """Get the percentiles of the scores, interpolated in the bins.
+
+        Args:
+            q (list, optional): the percentiles, between 0 and 100.
+                Defaults to [5, 10, 25, 50, 75, 90, 95].
+
+        Returns:
+            np.array: the values of the percentiles, NaN if there is no
+                score.
+
+        """
+        q = np.asarray(q, dtype=float)
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+
+        # The underflow and the overflow are two extra bins which end at the
+        # minimum and at the maximum of the scores.
+        counts = np.concatenate([[self.underflow], self.counts,
+                                 [self.overflow]])
+        edges = np.concatenate([[min(self.minimum, self.bin_edges[0])],
+                                self.bin_edges,
+                                [max(self.maximum, self.bin_edges[-1])]])
+        cumulative_counts = np.cumsum(counts)
+        targets = q / 100 * self.count
+        bins = np.searchsorted(cumulative_counts, targets, side='left')
+        bins = np.minimum(bins, len(counts) - 1)
+        previous_counts = cumulative_counts[bins] - counts[bins]
+        fractions = np.divide(targets - previous_counts, counts[bins],
+                              out=np.zeros(len(bins)),
+                              where=counts[bins] > 0)
+        values = edges[bins] + fractions * (edges[bins+1] - edges[bins])
+        return np.clip(values, self.minimum, self.maximum)
+
+    def to_dict(self):
+        """Get the distribution in a JSON serializable format.
+
+        Returns:
+            dict: the histogram, the moments and the percentiles.
+
+        """
+        empty = self.count == 0
+        return {
+            'count': self.count,
+            'nb_missing': self.nb_missing,
+            'mean': None if empty else self.mean(),
+            'std': None if empty else self.std(),
+            'min': None if empty else self.minimum,
+            'max': None if empty else self.maximum,
+            'total': self.total,
+            'total_squares': self.total_squares,
+            'percentiles': {f'p{percentile:g}': None if empty else value
+                            for percentile, value
+                            in zip(PERCENTILES,
+                                   self.percentiles(PERCENTILES).tolist())},
+            'bin_edges': self.bin_edges.tolist(),
+            'counts': self.counts.tolist(),
+            'underflow': self.underflow,
+            'overflow': self.overflow,
+        }
+
+    @classmethod
+    def from_dict(cls, dict_distribution):
+        """Build a distribution from the output of to_dict.
+
+        Args:
+            dict_distribution (dict): the distribution as a dict.
+
+        Returns:
+            ScoreDistribution: the distribution.
+
+        """
+        distribution = cls(dict_distribution['bin_edges'])
+        distribution.counts = np.array(dict_distribution['counts'],
+                                       dtype=np.int64)
+        distribution.underflow = dict_distribution['underflow']
+        distribution.overflow = dict_distribution['overflow']
+        distribution.nb_missing = dict_distribution['nb_missing']
+        distribution.total = dict_distribution['total']
+        distribution.total_squares = dict_distribution['total_squares']
+        if distribution.count > 0:
+            distribution.minimum = dict_distribution['min']
+            distribution.maximum = dict_distribution['max']
+        return distribution
@@ -1,11 +1,14 @@
 """Scorer module."""
+import json
 import logging
 import os
+from statistics import NormalDist
 
 import numpy as np
-import textdistance
-from tqdm import tqdm
 
+from orphanet_translation import instrumentation, normalization
+from orphanet_translation.metrics.distribution import BIN_EDGES, \
+    ScoreDistribution
 
 logging.basicConfig()
 logger = logging.getLogger(__name__)
@@ -13,26 +16,56 @@ logger.setLevel(logging.INFO)
 
 TEXTDISTANCE_FUNCTIONS = \
     [
-     'jaro_wrinkler', 'jaro', 'strcmp95', 'needleman_wunsch', 'gotoh',
+     'jaro_winkler', 'jaro', 'strcmp95', 'needleman_wunsch', 'gotoh',
      'smith_waterman', 'jaccard', 'sorensen', 'sorensen_dice',
      'tversky', 'overlap', 'tanimoto', 'cosine', 'monge_elkan',
      'ratcliff_obershelp', 'identity'
     ]
 
+# These similarities are alignment scores, not normalized between 0 and 1.
+# The histograms of their distributions have bins of width 1 between
+# -UNNORMALIZED_MAX_SCORE and UNNORMALIZED_MAX_SCORE, the scores outside
+# are counted in the underflow and the overflow.
+UNNORMALIZED_FUNCTIONS = ['needleman_wunsch', 'gotoh', 'smith_waterman']
+UNNORMALIZED_MAX_SCORE = 100
+
+QUALITY_METRICS = ['label', 'best_label', 'mean_best_label', 'max_best_label']
+
+
+def _get_bin_edges(metric):
+    if metric in UNNORMALIZED_FUNCTIONS:
+        return np.arange(-UNNORMALIZED_MAX_SCORE, UNNORMALIZED_MAX_SCORE + 1)
+    return BIN_EDGES
+
+
+def _split_labels(labels):
+    return labels.split('|')
+
+
+def _split_non_empty_labels(labels):
+    return [label for label in labels.split('|') if label != '']
+
 
 class Scorer():
     """Scorer class to score the quality of the translations."""
 
-    def __init__(self, scoring_functions=['jaro']):
+    def __init__(self, scoring_functions=['jaro'], run_report=None,
+                 normalized=False):
         """Initialize Scorer.
 
         Args:
             scoring_functions (list of string, optional): the metrics used,
                 have to be a similaryty in textdistance. Defaults to 'jaro'.
-                Values in : ['jaro_wrinkler', 'jaro', 'strcmp95',
+                Values in : ['jaro_winkler', 'jaro', 'strcmp95',
                 'needleman_wunsch', 'gotoh', 'smith_waterman', 'jaccard',
                 'sorensen', 'sorensen_dice', 'tversky', 'overlap', 'tanimoto',
                 'cosine', 'monge_elkan', 'ratcliff_obershelp']
+            run_report (instrumentation.RunReport, optional): report where
+                the measures of each scoring step are recorded. Defaults to
+                a new report.
+            normalized (bool, optional): Flag to score the normalized labels
+                added by normalization.add_normalized_columns instead of the
+                original ones. Defaults to False.
 
         """
         if not all([metric in TEXTDISTANCE_FUNCTIONS
@@ -43,9 +76,14 @@ class Scorer():
             raise ValueError(error_msg)
 
         self.scoring_functions = scoring_functions
+        self.run_report = run_report if run_report is not None \
+            else instrumentation.RunReport()
+        self.distributions = {}
+        self.normalized = normalized
 
     @staticmethod
-    def _scoring_label(row, lang, scoring_function):
+    def _scoring_label(row, lang, scoring_function,
+                       split_labels=_split_labels):
         """Compare the two labels columns only.
 
         This function compares the labels and does not look
@@ -57,6 +95,8 @@ class Scorer():
             lang (str): the two letters name of the language.
             scoring_function (func): a function which compute
                 similarity between two strings.
+            split_labels (func, optional): a function which splits the
+                labels separated by '|'. Defaults to keeping all of them.
 
         Returns:
             float: the maximum of the similarity between the obtained labels
@@ -66,13 +106,14 @@ class Scorer():
         lang = lang.capitalize()
         if row['label'+lang] != '' and row['goldLabel'+lang] != '':
             score = max([scoring_function(row['goldLabel'+lang], elem)
-                         for elem in row['label'+lang].split('|')])
+                         for elem in split_labels(row['label'+lang])])
         else:
             score = np.nan
         return score
 
     @staticmethod
-    def _scoring_best_label(row, lang, scoring_function):
+    def _scoring_best_label(row, lang, scoring_function,
+                            split_labels=_split_labels):
         """Compare the translations with the gold label.
 
         This function compares the gold label with the labels and altLabels of
@@ -83,6 +124,8 @@ class Scorer():
             lang (str): the two letter name of the language.
             scoring_function (func): a function which compute
                 similarity between two strings.
+            split_labels (func, optional): a function which splits the
+                labels separated by '|'. Defaults to keeping all of them.
 
         Returns:
             float: the maximum of the similarity between the obtained labels
@@ -92,14 +135,15 @@ class Scorer():
         lang = lang.capitalize()
         if row['label'+lang] != '' and row['goldLabel'+lang] != '':
             score = max([scoring_function(row['goldLabel'+lang], elem)
-                         for elem in row['label'+lang].split('|')
-                         + row['alt'+lang].split('|')])
+                         for elem in split_labels(row['label'+lang])
+                         + split_labels(row['alt'+lang])])
         else:
             score = np.nan
         return score
 
     @staticmethod
-    def _scoring_mean_best_label(row, lang, scoring_function):
+    def _scoring_mean_best_label(row, lang, scoring_function,
+                                 split_labels=_split_labels):
         """Mean of the comparison of all translations and all the gold labels.
 
         This function compares the gold label and altLabels with the labels
@@ -111,6 +155,8 @@ class Scorer():
             lang (str): the two letter name of the language.
             scoring_function (func): a function which compute similarity
                 between two strings.
+            split_labels (func, optional): a function which splits the
+                labels separated by '|'. Defaults to keeping all of them.
 
         Returns:
             float: the mean of the max similarity between the obtained labels
@@ -121,16 +167,17 @@ class Scorer():
         if row['label'+lang] != '' and row['goldLabel'+lang] != '':
             score = np.mean(
                 [max([scoring_function(elem_gold, elem)
-                      for elem in row['label'+lang].split('|')
-                      + row['alt'+lang].split('|')])
+                      for elem in split_labels(row['label'+lang])
+                      + split_labels(row['alt'+lang])])
                  for elem_gold in [row['goldLabel'+lang]]
-                 + row['goldAlt'+lang].split('|')])
+                 + split_labels(row['goldAlt'+lang])])
         else:
             score = np.nan
         return score
 
     @staticmethod
-    def _scoring_max_best_label(row, lang, scoring_function):
+    def _scoring_max_best_label(row, lang, scoring_function,
+                                split_labels=_split_labels):
         """Max of the comparison of all translations and all the gold labels.
 
         This function compares the gold label and altLabels with the labels
@@ -142,6 +189,8 @@ class Scorer():
             lang (str): the two letter name of the language.
             scoring_function (func): a function which compute similarity
                 between two strings.
+            split_labels (func, optional): a function which splits the
+                labels separated by '|'. Defaults to keeping all of them.
 
         Returns:
             float: the max of the max similarity between the obtained labels
@@ -152,20 +201,101 @@ class Scorer():
         if row['label'+lang] != '' and row['goldLabel'+lang] != '':
             score = max(
                 [max([scoring_function(elem_gold, elem)
-                      for elem in row['label'+lang].split('|')
-                      + row['alt'+lang].split('|')])
+                      for elem in split_labels(row['label'+lang])
+                      + split_labels(row['alt'+lang])])
                  for elem_gold in [row['goldLabel'+lang]]
-                 + row['goldAlt'+lang].split('|')])
+                 + split_labels(row['goldAlt'+lang])])
         else:
             score = np.nan
         return score
 
+    @staticmethod
+    def _count_pairs(translation_df, lang, quality_metric,
+                     split_labels=_split_labels):
+        """Count the pairs of labels compared for a quality metric.
+
+        Args:
+            translation_df (pd.DataFrame): dataFrame with the gold label and
+                the translations.
+            lang (str): the two letter name of the language.
+            quality_metric (str): name of the quality metric.
+            split_labels (func, optional): the function splitting the labels
+                in the scoring functions. Defaults to keeping all of them.
+
+        Returns:
+            int: the number of calls to the similarity function.
+
+        """
+        lang = lang.capitalize()
+        scored = (translation_df['label'+lang] != '') \
+            & (translation_df['goldLabel'+lang] != '')
+        scored_df = translation_df[scored]
+
+        def count_labels(column):
+            return scored_df[column+lang].map(
+                lambda cell: len(split_labels(cell)))
+
+        nb_pairs = count_labels('label')
+        if quality_metric != 'label':
+            nb_pairs += count_labels('alt')
+        if quality_metric in ['mean_best_label', 'max_best_label']:
+            nb_pairs *= count_labels('goldAlt') + 1
+        return int(nb_pairs.sum())
+
+    def __get_split_labels(self):
+        """Get the function splitting the labels of a cell.
+
+        Normalization can empty a cell of altLabels, the empty labels are
+        then not compared.
+        """
+        if self.normalized:
+            return _split_non_empty_labels
+        return _split_labels
+
+    def __get_scored_labels(self, translation_df, lang):
+        """Get the label columns of a language which have to be scored.
+
+        With normalized labels, the normalized columns are returned under
+        the names of the original ones, so that the scoring functions do
+        not have to know about the normalization.
+        """
+        if not self.normalized:
+            return translation_df
+        lang = lang.capitalize()
+        columns = {normalization.get_normalized_column_name(column+lang):
+                   column+lang
+                   for column in ['label', 'alt', 'goldLabel', 'goldAlt']}
+        if not set(columns).issubset(translation_df.columns):
+            error_msg = f'Normalized labels in {lang} are missing, use '\
+                        + 'normalization.add_normalized_columns first.'
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        return translation_df[list(columns)].rename(columns=columns)
+
+    def __score_rows(self, translation_df, lang, metric, quality_metric):
+        # Imported here to keep the import of the package fast.
+        import textdistance
+
+        translation_df = self.__get_scored_labels(translation_df, lang)
+        metric_function = getattr(self, '_scoring_' + quality_metric)
+        scoring_function = getattr(textdistance, metric)
+        split_labels = self.__get_split_labels()
+        return translation_df.apply(
+            lambda row: metric_function(row, lang, scoring_function,
+                                        split_labels),
+            axis=1
+        )
+
     def __get_score(self, translation_df, metric, output_dir):
         """Get the score for a given metric.
 
         This function compute the score for a given metric, then creates
-        a text file with the results inside and the histogram for each
-        language of the four metrics described in the paper.
+        a text file with the results inside and a JSON file with the
+        histogram and the percentiles for each language of the four metrics
+        described in the paper. The distributions are also kept in
+        self.distributions, to be merged with the ones of other chunks. The
+        metrics in UNNORMALIZED_FUNCTIONS have bins of width 1 instead of
+        the bins between 0 and 1.
 
         Args:
             translation_df (pd.DataFrame): dataFrame with the gold label and
@@ -176,12 +306,12 @@ class Scorer():
                 created
 
         Returns:
-            [type]: [description]
+            pd.DataFrame: translation + columns with the scores.
 
         """
+        from tqdm import tqdm
+
         logger.info(f'Start computing results with {metric} metric.')
-        quality_metrics = ['label', 'best_label', 'mean_best_label',
-                           'max_best_label']
         dict_results = {}
         columns = translation_df.columns
         lang_list = [column.replace('label', '') for column in columns
@@ -189,22 +319,42 @@ class Scorer():
         filename = os.path.join(output_dir, metric+'.txt')
         result_file = open(filename, 'wt')
         result_file.write(f'Results computed with the {metric} metric.\n')
+        bin_edges = _get_bin_edges(metric)
 
         for lang in tqdm(lang_list):
             result_file.write(f'Result in {lang}:\n')
-            for quality_metric in quality_metrics:
+            for quality_metric in QUALITY_METRICS:
                 column_name = 'score' + metric.capitalize()\
                               + lang.capitalize() + quality_metric.capitalize()
-                metric_function = getattr(self, '_scoring_' + quality_metric)
                 logger.debug(f'{column_name}, {lang}, {lang_list}')
-                translation_df.loc[:, column_name] =\
-                    translation_df.apply(
-                        lambda row: metric_function(
-                            row, lang, getattr(textdistance, metric)),
-                        axis=1
-                    )
+                # Counted outside of the stage to not measure the count
+                nb_pairs = self._count_pairs(
+                    self.__get_scored_labels(translation_df, lang), lang,
+                    quality_metric, self.__get_split_labels())
+                with self.run_report.stage('score', metric=metric,
+                                           lang=lang,
+                                           quality_metric=quality_metric) \
+                        as stage:
+                    translation_df.loc[:, column_name] =\
+                        self.__score_rows(translation_df, lang, metric,
+                                          quality_metric)
+                    stage['rows'] = len(translation_df)
+                    stage['pairs'] = nb_pairs
+                    dict_results.setdefault(lang, {})[quality_metric] = \
+                        ScoreDistribution.from_scores(
+                            translation_df[column_name].to_numpy(dtype=float),
+                            bin_edges)
                 mean_result = translation_df.loc[:, column_name].mean()
                 result_file.write(f'\t{quality_metric}: {mean_result}\n')
+
+        self.distributions[metric] = dict_results
+        filename = os.path.join(output_dir, metric+'_distribution.json')
+        with open(filename, 'wt') as json_file:
+            json.dump({lang: {quality_metric: distribution.to_dict()
+                              for quality_metric, distribution
+                              in dict_lang.items()}
+                       for lang, dict_lang in dict_results.items()},
+                      json_file, indent=2)
         return translation_df
 
     def score(self, translation_df, output_dir='results'):
@@ -231,3 +381,134 @@ class Scorer():
                                               output_dir)
 
         return translation_df
+
+    def __estimate_lang(self, translation_df, lang, metric, ci_width,
+                        batch_size, min_sample_size, z_value, random_state):
+        """Estimate the four quality metrics on a sample of a language.
+
+        The entities with a label and a gold label in the language are
+        shuffled and scored by batches until the confidence interval of each
+        quality metric is narrower than ci_width, or until all the entities
+        are scored. The width is only checked once min_sample_size entities
+        are scored, so that a first batch without variance does not stop
+        the sampling with a null interval.
+
+        Returns:
+            tuple of np.array: the means, the half widths of the confidence
+                intervals and the number of scored entities.
+
+        """
+        lang_cap = lang.capitalize()
+        scored_df = self.__get_scored_labels(translation_df, lang)
+        eligible = translation_df[(scored_df['label'+lang_cap] != '')
+                                  & (scored_df['goldLabel'+lang_cap] != '')]
+        nb_elems = len(eligible)
+        if nb_elems == 0:
+            return (np.full(len(QUALITY_METRICS), np.nan),
+                    np.full(len(QUALITY_METRICS), np.nan), 0)
+
+        order = random_state.permutation(nb_elems)
+        scores = np.empty((0, len(QUALITY_METRICS)))
+        for start in range(0, nb_elems, batch_size):
+            batch_df = eligible.iloc[order[start:start+batch_size]]
+            batch_scores = np.column_stack(
+                [self.__score_rows(batch_df, lang, metric, quality_metric)
+                 .to_numpy(dtype=float)
+                 for quality_metric in QUALITY_METRICS]
+            )
+            scores = np.concatenate([scores, batch_scores])
+
+            nb_scored = len(scores)
+            means = scores.mean(axis=0)
+            if nb_scored == nb_elems:
+                # All the entities are scored, the means are exact.
+                std_errors = np.zeros(len(QUALITY_METRICS))
+            elif nb_scored > 1:
+                # Normal approximation with finite population correction.
+                std_errors = scores.std(axis=0, ddof=1) / np.sqrt(nb_scored)\
+                    * np.sqrt(1 - nb_scored / nb_elems)
+            else:
+                std_errors = np.full(len(QUALITY_METRICS), np.inf)
+            half_widths = z_value * std_errors
+            logger.debug(f'{metric}, {lang}, {nb_scored}/{nb_elems}: '
+                         + f'{means} +/- {half_widths}')
+            if nb_scored >= min_sample_size \
+                    and np.all(2 * half_widths <= ci_width):
+                break
+        return means, half_widths, nb_scored
+
+    def estimate(self, translation_df, output_dir='results', ci_width=0.01,
+                 confidence=0.95, batch_size=100, min_sample_size=100,
+                 seed=None):
+        """Estimate the quality of the translations on a sample of entities.
+
+        For each language, a random sample of the entities is scored
+        progressively until the confidence intervals of the four quality
+        metrics are narrower than ci_width. The text files have the same
+        format as the ones of score, but are marked as estimates.
+
+        Args:
+            translation_df (pd.DataFrame): DataFrame with the translated
+                labels and the gold ones. For each language, the following
+                columns are needed:
+                ['labelLang', 'altLang', 'goldLabelLang', 'goldAltLang']
+            output_dir (str, optional): path of the folder where the files
+                will be created. Defaults to 'results'.
+            ci_width (float, optional): width of the confidence intervals
+                under which the sampling stops. Defaults to 0.01.
+            confidence (float, optional): confidence level of the intervals.
+                Defaults to 0.95.
+            batch_size (int, optional): number of entities scored between two
+                checks of the confidence intervals. Defaults to 100.
+            min_sample_size (int, optional): number of entities scored in a
+                language before the width of the confidence intervals is
+                checked. Defaults to 100.
+            seed (int, optional): seed of the sampling. Defaults to None.
+
+        Returns:
+            dict: for each metric and language, a dict with the mean and the
+                half width of the confidence interval of each quality metric,
+                and the number of entities scored.
+
+        """
+        if not os.path.exists(output_dir):
+            os.mkdir(output_dir)
+
+        random_state = np.random.RandomState(seed)
+        z_value = NormalDist().inv_cdf((1 + confidence) / 2)
+        lang_list = [column.replace('label', '')
+                     for column in translation_df.columns
+                     if 'label' in column[:5]]
+        dict_results = {}
+
+        for metric in self.scoring_functions:
+            logger.info(f'Start estimating results with {metric} metric.')
+            dict_results[metric] = {}
+            filename = os.path.join(output_dir, metric+'.txt')
+            with open(filename, 'wt') as result_file:
+                result_file.write(f'Estimated results computed with the '
+                                  + f'{metric} metric on a sample of the '
+                                  + f'entities ({confidence:.0%} confidence '
+                                  + f'intervals).\n')
+                for lang in lang_list:
+                    with self.run_report.stage('estimate', metric=metric,
+                                               lang=lang) as stage:
+                        means, half_widths, nb_scored = self.__estimate_lang(
+                            translation_df, lang, metric, ci_width,
+                            batch_size, min_sample_size, z_value,
+                            random_state)
+                        stage['rows'] = nb_scored
+                    dict_results[metric][lang] = {
+                        'nb_scored': nb_scored,
+                        **{quality_metric: (mean, half_width)
+                           for quality_metric, mean, half_width
+                           in zip(QUALITY_METRICS, means, half_widths)}
+                    }
+                    result_file.write(f'Result in {lang}:\n')
+                    for quality_metric, mean, half_width in \
+                            zip(QUALITY_METRICS, means, half_widths):
+                        result_file.write(f'\t{quality_metric}: {mean} '
+                                          + f'+/- {half_width} '
+                                          + f'(estimate on {nb_scored} '
+                                          + f'entities)\n')
+        return dict_results
@@ -0,0 +1,99 @@
+"""Normalize the labels to score them without case, accents or punctuation."""
+import re
+import unicodedata
+
+
+def normalize_label(label):
+    """Normalize a label.
+
+    The label is decomposed with Unicode NFKD, the accents are removed, the
+    label is casefolded and the punctuation is replaced by spaces.
+
+    Args:
+        label (str): the label.
+
+    Returns:
+        str: the normalized label.
+
+    """
+    label = unicodedata.normalize('NFKD', label)
+    label = ''.join(' ' if unicodedata.category(char)[0] == 'P' else char
+                    for char in label if not unicodedata.combining(char))
+    return re.sub(r'\s+', ' ', label.casefold()).strip()
+
+
+def _normalize_cell(cell, cache, excluded=()):
+    """Normalize the labels of a cell separated by '|', without duplicates."""
+    normalized_labels = []
+    for label in cell.split('|'):
+        if label not in cache:
+            cache[label] = normalize_label(label)
+        normalized_label = cache[label]
+        if normalized_label != '' and normalized_label not in excluded \
+                and normalized_label not in normalized_labels:
+            normalized_labels.append(normalized_label)
+    return '|'.join(normalized_labels)
+
+
+def _normalize_column(column, cache, excluded_column=None):
+    if excluded_column is None:
+        cells = {cell: _normalize_cell(cell, cache)
+                 for cell in column.unique()}
+        return column.map(cells)
+    pairs = {pair: _normalize_cell(pair[0], cache, pair[1].split('|'))
+             for pair in set(zip(column, excluded_column))}
+    return [pairs[pair] for pair in zip(column, excluded_column)]
+
+
+def get_normalized_column_name(column):
+    """Get the name of the normalized version of a column.
+
+    Args:
+        column (str): the name of the column, e.g. 'goldLabelFr'.
+
+    Returns:
+        str: the name of the normalized column, e.g. 'normGoldLabelFr'.
+
+    """
+    return 'norm' + column[0].upper() + column[1:]
+
+
+def add_normalized_columns(translation_df, cache=None):
+    """Add the normalized labels to a DataFrame.
+
+    For each column labelLang, altLang, goldLabelLang and goldAltLang, a
+    column normLabelLang, normAltLang, normGoldLabelLang and normGoldAltLang
+    is added. Each distinct label is normalized once, and the labels which
+    become identical after normalization are kept once: the altLabels equal
+    to a label of the same entity are removed.
+
+    Args:
+        translation_df (pd.DataFrame): DataFrame with the translated labels
+            and the gold ones. Missing values have to be empty strings.
+        cache (dict, optional): the labels already normalized, shared
+            between calls to normalize each label only once. Defaults to
+            a new dict.
+
+    Returns:
+        pd.DataFrame: translation_df with the normalized columns.
+
+    """
+    if cache is None:
+        cache = {}
+    lang_list = [column.replace('goldLabel', '')
+                 for column in translation_df.columns
+                 if 'goldLabel' in column[:9]]
+    for lang in lang_list:
+        for label_column, alt_column in [('label', 'alt'),
+                                         ('goldLabel', 'goldAlt')]:
+            if label_column+lang not in translation_df.columns:
+                continue
+            norm_label = get_normalized_column_name(label_column+lang)
+            translation_df.loc[:, norm_label] = _normalize_column(
+                translation_df[label_column+lang], cache)
+            if alt_column+lang in translation_df.columns:
+                translation_df.loc[:, get_normalized_column_name(
+                    alt_column+lang)] = _normalize_column(
+                        translation_df[alt_column+lang], cache,
+                        translation_df[norm_label])
+    return translation_df
@@ -0,0 +1,168 @@
+"""Retrieve the Orphanet entities matching a label."""
+import logging
+
+import numpy as np
+import textdistance
+
+from orphanet_translation.metrics.scorer import TEXTDISTANCE_FUNCTIONS
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def _get_ngrams(label, ngram_size):
+    label = ' ' + label.casefold() + ' '
+    if len(label) <= ngram_size:
+        return {label}
+    return {label[i:i+ngram_size] for i in range(len(label)-ngram_size+1)}
+
+
+class NgramIndex():
+    """Character n-gram inverted index over the gold labels of Orphanet."""
+
+    def __init__(self, ordo_df, lang_list=None, ngram_size=3):
+        """Initialize NgramIndex.
+
+        Args:
+            ordo_df (pd.DataFrame): DataFrame with the gold labels indexed by
+                OrphaNumber, as returned by loader.load_ordo_data. For each
+                language, the columns ['goldLabelLang', 'goldAltLang'] are
+                needed.
+            lang_list (list of string, optional): the two letters name of the
+                languages to index. Defaults to all the languages in ordo_df.
+            ngram_size (int, optional): size of the character n-grams.
+                Defaults to 3.
+
+        """
+        if lang_list is None:
+            lang_list = [column.replace('goldLabel', '').lower()
+                         for column in ordo_df.columns
+                         if 'goldLabel' in column[:9]]
+
+        self.ngram_size = ngram_size
+        self.lang_list = lang_list
+        self._labels = {}
+        self._entities = {}
+        self._starts = {}
+        self._nb_ngrams = {}
+        self._postings = {}
+
+        for lang in lang_list:
+            self.__index_lang(ordo_df, lang)
+
+    def __index_lang(self, ordo_df, lang):
+        lang_cap = lang.capitalize()
+        labels = []
+        entities = []
+        # The labels of an entity are contiguous, from its start to the
+        # start of the next entity.
+        starts = []
+        for orpha_number, gold_label, gold_alt in \
+                zip(ordo_df.index, ordo_df['goldLabel'+lang_cap],
+                    ordo_df['goldAlt'+lang_cap]):
+            entity_labels = [label for label in [gold_label]
+                             + gold_alt.split('|') if label != '']
+            if entity_labels:
+                entities.append(orpha_number)
+                starts.append(len(labels))
+                labels.extend(entity_labels)
+        starts.append(len(labels))
+
+        postings = {}
+        nb_ngrams = np.zeros(len(labels), dtype=np.int32)
+        for id_label, label in enumerate(labels):
+            ngrams = _get_ngrams(label, self.ngram_size)
+            nb_ngrams[id_label] = len(ngrams)
+            for ngram in ngrams:
+                postings.setdefault(ngram, []).append(id_label)
+
+        # Casefolded like the n-grams, so that the reranking is case
+        # insensitive too.
+        self._labels[lang] = [label.casefold() for label in labels]
+        self._entities[lang] = np.array(entities, dtype=object)
+        self._starts[lang] = np.array(starts, dtype=np.int64)
+        self._nb_ngrams[lang] = nb_ngrams
+        self._postings[lang] = {ngram: np.array(ids, dtype=np.int32)
+                                for ngram, ids in postings.items()}
+        logger.debug(f'{len(labels)} labels and {len(postings)} n-grams '
+                     + f'indexed in {lang}.')
+
+    def candidates(self, label, lang, nb_candidates=100):
+        """Get the entities sharing the most n-grams with a label.
+
+        An entity is as similar as the closest of its gold labels and
+        altLabels, so that an entity with many similar synonyms takes a
+        single candidate.
+
+        Args:
+            label (str): the label to look for.
+            lang (str): the two letters name of the language.
+            nb_candidates (int, optional): maximum number of entities
+                returned. Defaults to 100.
+
+        Returns:
+            np.array: the ids of the candidate entities, sorted by
+                decreasing Jaccard similarity of their n-grams.
+
+        """
+        ngrams = _get_ngrams(label, self.ngram_size)
+        postings = self._postings[lang]
+        id_list = [postings[ngram] for ngram in ngrams if ngram in postings]
+        if not id_list:
+            return np.array([], dtype=np.int32)
+
+        nb_ngrams = self._nb_ngrams[lang]
+        counts = np.bincount(np.concatenate(id_list), minlength=len(nb_ngrams))
+        similarities = counts / (len(ngrams) + nb_ngrams - counts)
+        similarities = np.maximum.reduceat(similarities,
+                                           self._starts[lang][:-1])
+
+        ids = np.flatnonzero(similarities)
+        if len(ids) > nb_candidates:
+            ids = ids[np.argpartition(-similarities[ids],
+                                      nb_candidates)[:nb_candidates]]
+        return ids[np.argsort(-similarities[ids], kind='stable')]
+
+    def query(self, label, lang, k=10, metric='jaro', nb_candidates=100):
+        """Get the Orphanet entities a label most likely belongs to.
+
+        The candidates are generated with the n-gram index, then reranked
+        with the similarity metric. An entity is scored with the best
+        similarity between the label and its gold labels and altLabels.
+
+        The comparison is case insensitive, the label and the gold labels
+        are casefolded in both steps.
+
+        Args:
+            label (str): the label to look for.
+            lang (str): the two letters name of the language.
+            k (int, optional): number of entities returned. Defaults to 10.
+            metric (str, optional): name of the algorithm used to compute the
+                similarity, has to be in textdistance. Defaults to 'jaro'.
+            nb_candidates (int, optional): number of entities reranked.
+                Defaults to 100.
+
+        Returns:
+            list of tuple: the (OrphaNumber, score) of the k best entities,
+                sorted by decreasing score.
+
+        """
+        if metric not in TEXTDISTANCE_FUNCTIONS:
+            error_msg = 'Unknown scoring function, look at the '\
+                        + 'doc to see the availables functions name.'
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        scoring_function = getattr(textdistance, metric)
+        label = label.casefold()
+
+        starts = self._starts[lang]
+        scores = []
+        for id_entity in self.candidates(label, lang, nb_candidates):
+            gold_labels = \
+                self._labels[lang][starts[id_entity]:starts[id_entity+1]]
+            score = max(scoring_function(label, gold_label)
+                        for gold_label in gold_labels)
+            scores.append((self._entities[lang][id_entity], score))
+
+        return sorted(scores, key=lambda x: x[1], reverse=True)[:k]
@@ -0,0 +1,90 @@
+"""Score the quality of an already merged DataFrame."""
+import argparse
+import logging
+import os
+
+from orphanet_translation import normalization
+from orphanet_translation.metrics.scorer import Scorer, TEXTDISTANCE_FUNCTIONS
+
+logging.basicConfig()
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def score_file(input_file, metric_list, results_folder, ci_width=None,
+               normalize=False):
+    """Score the translations of a merged DataFrame saved in JSON.
+
+    Args:
+        input_file (str): JSON file with the translated labels and the gold
+            ones. For each language, the following columns are needed:
+            ['labelLang', 'altLang', 'goldLabelLang', 'goldAltLang']
+        metric_list (list): List of string with the name of the quality
+            metrics.
+        results_folder (str): Folder where the results will be written.
+        ci_width (float, optional): if specified, the quality scores are
+            estimated on a sample of the entities, until their confidence
+            intervals are narrower than ci_width. Defaults to None.
+        normalize (bool, optional): Flag to score the labels without case,
+            accents and punctuation. Defaults to False.
+
+    """
+    import pandas as pd
+
+    scoring = Scorer(metric_list, normalized=normalize)
+
+    logger.info('Load merged data from file.')
+    translation_df = pd.read_json(input_file, dtype=False)
+    translation_df.fillna('', inplace=True)
+
+    if normalize:
+        logger.info('Start normalizing labels.')
+        normalization.add_normalized_columns(translation_df)
+
+    if not os.path.exists(results_folder):
+        os.mkdir(results_folder)
+
+    if ci_width is None:
+        logger.info('Start computing quality scores.')
+        scoring.score(translation_df, output_dir=results_folder)
+    else:
+        logger.info('Start estimating quality scores.')
+        scoring.estimate(translation_df, output_dir=results_folder,
+                         ci_width=ci_width)
+
+
+def main(argv=None):
+    """Entry point of the score command.
+
+    Args:
+        argv (list, optional): the arguments of the command. Defaults to
+            sys.argv.
+
+    """
+    parser = argparse.ArgumentParser(
+        description='Score the translations of an already merged DataFrame'
+    )
+    parser.add_argument('--input', required=True,
+                        help='JSON file with the translations and the gold'
+                        + ' labels.')
+    parser.add_argument('--result_folder', required=True,
+                        help='Folder where the results will be written.')
+    parser.add_argument('--metrics', nargs='+', required=True,
+                        choices=TEXTDISTANCE_FUNCTIONS,
+                        help='Metrics used for the quality score.')
+    parser.add_argument('--progressive', type=float, metavar='CI_WIDTH',
+                        help='Estimate the quality scores on a sample of the'
+                        + ' entities until the width of the confidence'
+                        + ' intervals is under CI_WIDTH.')
+    parser.add_argument('--normalize', action='store_true',
+                        help='Flag to score the labels without case, accents'
+                        + ' and punctuation.')
+    args = parser.parse_args(argv)
+
+    score_file(input_file=args.input, metric_list=args.metrics,
+               results_folder=args.result_folder, ci_width=args.progressive,
+               normalize=args.normalize)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,11 @@ setup(
     name="orphanet_translation",
     version=__version__,
     packages=find_packages(),
+    entry_points={
+        'console_scripts': [
+            'orphanet-score=orphanet_translation.score:main',
+        ],
+    },
 
     description="",
     keywords="biomedical, ontology, translation, wikidata, orphanet",
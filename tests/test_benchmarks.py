@@ -0,0 +1,42 @@
+"""Test the synthetic data generator and the benchmarks."""
+
+import json
+import os
+import sys
+
+from orphanet_translation import loader
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'benchmarks'))
+import run_benchmarks  # noqa: E402
+import synthetic  # noqa: E402
+
+
+def test_generate_data_folder(tmp_path):
+    """Test that the loaders read the generated data folder."""
+    data_folder = str(tmp_path)
+    data = synthetic.generate_data_folder(data_folder, 50, ['en', 'fr'])
+
+    ordo_df = loader.load_ordo_data(data_folder, ['en', 'fr'])
+    assert(len(ordo_df) == 50)
+    assert(set(ordo_df.columns) == {'goldLabelEn', 'goldAltEn',
+                                    'goldLabelFr', 'goldAltFr'})
+    wikidata_df = loader.load_wikidata_data(data_folder, ['en', 'fr'])
+    assert(len(wikidata_df) == (data['wikidata_df'] != '').any(axis=1).sum())
+    onto_dict = loader.load_external_onto_wikidata_data(data_folder)
+    assert(set(onto_dict) == set(synthetic.ONTO_LIST))
+    assert(all('labelFr' in onto_df.columns for onto_df in onto_dict.values()))
+    assert(len(loader.load_ordo_external_references(data_folder)) > 0)
+
+
+def test_main(tmp_path):
+    """Test the benchmarks on a subset of the languages."""
+    output_file = os.path.join(str(tmp_path), 'benchmark_results.json')
+    run_benchmarks.main([0.005], ['jaro'], output_file, repeat=1,
+                        lang_list=['en', 'fr'])
+    with open(output_file) as json_file:
+        report = json.load(json_file)
+    benchmarks = {result['benchmark'] for result in report['results']}
+    assert('load_ordo_data' in benchmarks)
+    assert('load_external_onto_wikidata_data' in benchmarks)
+    assert('Scorer.score.jaro' in benchmarks)
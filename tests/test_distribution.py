@@ -0,0 +1,72 @@
+"""Test class ScoreDistribution."""
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from orphanet_translation.metrics import distribution, scorer
+
+
+def test_merge():
+    """Test that merging chunks gives the distribution of all the scores."""
+    scores = np.random.RandomState(0).rand(1000)
+    scores[::10] = np.nan
+    full = distribution.ScoreDistribution.from_scores(scores)
+    merged = distribution.ScoreDistribution.from_scores(scores[:300])
+    merged.merge(distribution.ScoreDistribution.from_scores(scores[300:]))
+
+    assert(np.array_equal(full.counts, merged.counts))
+    assert(merged.count == 900 and merged.nb_missing == 100)
+    assert(np.isclose(merged.mean(), np.nanmean(scores)))
+    assert(np.isclose(merged.std(), np.nanstd(scores)))
+    assert(np.allclose(merged.percentiles([25, 50, 75]),
+                       np.nanpercentile(scores, [25, 50, 75]), atol=0.05))
+
+    copy = distribution.ScoreDistribution.from_dict(merged.to_dict())
+    assert(copy.to_dict() == merged.to_dict())
+
+
+def test_scorer_distribution(tmp_path):
+    """Test the distribution file written by Scorer."""
+    columns = ['labelEn', 'altEn', 'goldLabelEn', 'goldAltEn']
+    values = [['test', 'test1|test2', 'test', 'test2|test1'],
+              ['disease', 'disease',  'disease', 'flu'],
+              ['', '', 'cancer', '']]
+    input_df = pd.DataFrame(values, columns=columns)
+    scorer_tool = scorer.Scorer(['jaro'])
+    scorer_tool.score(input_df, output_dir=str(tmp_path))
+
+    path = os.path.join(str(tmp_path), 'jaro_distribution.json')
+    with open(path) as json_file:
+        dict_distribution = json.load(json_file)['En']['mean_best_label']
+    assert(dict_distribution['count'] == 2)
+    assert(dict_distribution['nb_missing'] == 1)
+    assert(dict_distribution['mean'] == 0.75)
+    assert(dict_distribution['counts'][-1] == 1)
+    assert(scorer_tool.distributions['jaro']['En']['label'].mean() == 1)
+
+
+def test_unnormalized_metric(tmp_path):
+    """Test the distribution of a metric not normalized between 0 and 1."""
+    columns = ['labelEn', 'altEn', 'goldLabelEn', 'goldAltEn']
+    values = [['marfan syndrom', 'mfs', 'marfan syndrome', 'mfs'],
+              ['a' * 150, '', 'a' * 150, ''],
+              ['', '', 'cancer', '']]
+    input_df = pd.DataFrame(values, columns=columns)
+    scorer_tool = scorer.Scorer(['needleman_wunsch'])
+    output_df = scorer_tool.score(input_df, output_dir=str(tmp_path))
+    assert(output_df.loc[0, 'scoreNeedleman_wunschEnLabel'] == 13)
+
+    path = os.path.join(str(tmp_path), 'needleman_wunsch_distribution.json')
+    with open(path) as json_file:
+        dict_distribution = json.load(json_file)['En']['label']
+    assert(dict_distribution['bin_edges'][0] == -100)
+    assert(dict_distribution['bin_edges'][-1] == 100)
+    assert(dict_distribution['count'] == 2)
+    assert(dict_distribution['nb_missing'] == 1)
+    assert(dict_distribution['counts'][113] == 1)
+    assert(dict_distribution['overflow'] == 1)
+    assert(dict_distribution['max'] == 150)
+    assert(dict_distribution['mean'] == 81.5)
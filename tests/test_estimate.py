@@ -0,0 +1,54 @@
+"""Test the estimation of the scores of Scorer."""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from orphanet_translation.metrics import scorer
+
+
+def test_estimate(tmp_path):
+    """Test that the estimate converges to the full score."""
+    columns = ['labelEn', 'altEn', 'goldLabelEn', 'goldAltEn']
+    values = [['test', 'test1|test2', 'test', 'test2|test1'],
+              ['disease', 'disease', 'disease', 'flu'],
+              ['flu', '', 'influenza', ''],
+              ['', '', 'cancer', '']] * 10
+    input_df = pd.DataFrame(values, columns=columns)
+    scorer_tool = scorer.Scorer(['jaro'])
+
+    output_df = scorer_tool.score(input_df.copy(), output_dir=str(tmp_path))
+    results = scorer_tool.estimate(input_df, output_dir=str(tmp_path),
+                                   ci_width=0, batch_size=7, seed=0)
+
+    assert(results['jaro']['En']['nb_scored'] == 30)
+    for quality_metric in scorer.QUALITY_METRICS:
+        mean, half_width = results['jaro']['En'][quality_metric]
+        column_name = 'scoreJaroEn' + quality_metric.capitalize()
+        assert(np.isclose(mean, output_df[column_name].mean()))
+        assert(np.isclose(half_width, 0))
+
+    with open(os.path.join(str(tmp_path), 'jaro.txt')) as result_file:
+        assert(result_file.readline().startswith('Estimated results'))
+
+
+def test_estimate_edge_cases(tmp_path):
+    """Test a single entity and a first batch without variance."""
+    columns = ['labelEn', 'altEn', 'goldLabelEn', 'goldAltEn',
+               'labelFr', 'altFr', 'goldLabelFr', 'goldAltFr']
+    values = [['flu', '', 'flu', '', 'grippe', '', 'grippe', '']] \
+        + [['', '', 'flu', '', 'grippe', '', 'grippe', '']] * 37 \
+        + [['', '', 'flu', '', 'rhume', '', 'grippe', '']] * 2
+    input_df = pd.DataFrame(values, columns=columns)
+    scorer_tool = scorer.Scorer(['identity'])
+
+    results = scorer_tool.estimate(input_df, output_dir=str(tmp_path),
+                                   ci_width=0.1, batch_size=5,
+                                   min_sample_size=20, seed=0)
+
+    # The only entity with a label in English is scored exactly.
+    assert(results['identity']['En']['nb_scored'] == 1)
+    assert(results['identity']['En']['label'] == (1, 0))
+    # A first batch with identical scores does not stop the sampling.
+    assert(results['identity']['Fr']['nb_scored'] >= 20)
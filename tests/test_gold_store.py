@@ -0,0 +1,46 @@
+"""Test class GoldLabelStore."""
+
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from orphanet_translation import gold_store
+
+
+def test_store(tmp_path):
+    """Test that the store gives back the gold labels."""
+    columns = ['goldLabelEn', 'goldAltEn', 'goldLabelFr', 'goldAltFr']
+    values = [['cystic fibrosis', 'mucoviscidosis', 'mucoviscidose',
+               'fibrose kystique|mucoviscidose congénitale'],
+              ['', '', '', ''],
+              ['Marfan syndrome', '', 'syndrome de Marfan', 'MFS|Marfan']]
+    ordo_df = pd.DataFrame(values, columns=columns, index=['586', '1', '558'])
+    path = os.path.join(str(tmp_path), 'gold.store')
+    gold_store.write_gold_store(ordo_df, path)
+
+    store = gold_store.GoldLabelStore(path)
+    assert(len(store) == 3)
+    assert('586' in store and 587 not in store)
+    assert(store.get_label(586, 'en') == 'cystic fibrosis')
+    assert(store.get_alt('586', 'fr')
+           == 'fibrose kystique|mucoviscidose congénitale')
+    assert(store.get_label('1', 'en') == '')
+    assert(store.get_label('558', 'fr') == 'syndrome de Marfan')
+
+    worker_store = pickle.loads(pickle.dumps(store))
+    assert(len(pickle.dumps(store)) < 200)
+    assert(worker_store.get_alt('558', 'fr') == 'MFS|Marfan')
+
+    orpha_numbers = store.orpha_numbers
+    assert(orpha_numbers.tolist() == [586, 1, 558])
+    with pytest.raises(KeyError):
+        store.get_label('2', 'en')
+    assert('abc' not in store and None not in store)
+    with pytest.raises(KeyError):
+        store.get_label('abc', 'en')
+    # Closing works while the OrphaNumbers are still referenced.
+    store.close()
+    worker_store.close()
+    assert(orpha_numbers.tolist() == [586, 1, 558])
@@ -0,0 +1,35 @@
+"""Test class RunReport."""
+
+import json
+import os
+
+import pandas as pd
+
+from orphanet_translation import instrumentation
+from orphanet_translation.metrics import scorer
+
+
+def test_scorer_report(tmp_path):
+    """Test the stages recorded when scoring."""
+    columns = ['labelEn', 'altEn', 'goldLabelEn', 'goldAltEn']
+    values = [['test', 'test1|test2', 'test', 'test2|test1'],
+              ['disease', 'disease',  'disease', 'flu'],
+              ['', '', 'cancer', '']]
+    input_df = pd.DataFrame(values, columns=columns)
+    run_report = instrumentation.RunReport()
+    scorer_tool = scorer.Scorer(['jaro'], run_report=run_report)
+    scorer_tool.score(input_df, output_dir=str(tmp_path))
+
+    pairs = {stage['quality_metric']: stage['pairs']
+             for stage in run_report.stages}
+    assert(pairs == {'label': 2, 'best_label': 5, 'mean_best_label': 13,
+                     'max_best_label': 13})
+    assert(all(stage['rows'] == 3 for stage in run_report.stages))
+
+    path = os.path.join(str(tmp_path), 'run_report.json')
+    run_report.write(path)
+    with open(path) as json_file:
+        stages = json.load(json_file)['stages']
+    assert(len(stages) == 4)
+    assert(stages[0]['wall_time'] >= 0)
+    assert(stages[0]['peak_rss_increase_mb'] >= 0)
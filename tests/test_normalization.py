@@ -0,0 +1,76 @@
+"""Test the normalization of the labels."""
+
+import pandas as pd
+
+from orphanet_translation import instrumentation, normalization
+from orphanet_translation.metrics import scorer
+
+
+def test_normalize_label():
+    """Test the normalization of a single label."""
+    assert(normalization.normalize_label('Maladie de Crohn-Léśniowski')
+           == 'maladie de crohn lesniowski')
+    assert(normalization.normalize_label(' Syndrome  (MFS) ')
+           == 'syndrome mfs')
+    assert(normalization.normalize_label('STRASSE') == 'strasse')
+
+
+def test_normalized_score(tmp_path):
+    """Test that Scorer scores the normalized labels."""
+    columns = ['labelFr', 'altFr', 'goldLabelFr', 'goldAltFr']
+    values = [['Maladie de Crohn', 'maladie de crohn|Crohn',
+               'maladie de Crohn', 'Crohn|crohn']]
+    input_df = pd.DataFrame(values, columns=columns)
+    cache = {}
+    normalization.add_normalized_columns(input_df, cache)
+
+    assert(input_df.loc[0, 'normLabelFr'] == 'maladie de crohn')
+    assert(input_df.loc[0, 'normAltFr'] == 'crohn')
+    assert(input_df.loc[0, 'normGoldAltFr'] == 'crohn')
+    assert('Crohn' in cache)
+
+    output_df = scorer.Scorer(['identity'], normalized=True).score(
+        input_df, output_dir=str(tmp_path))
+    assert(output_df.loc[0, 'scoreIdentityFrLabel'] == 1)
+    assert(output_df.loc[0, 'scoreIdentityFrMean_best_label'] == 1)
+
+
+def test_normalized_score_empty_alt(tmp_path):
+    """Test that the altLabels emptied by the normalization are not scored."""
+    columns = ['labelFr', 'altFr', 'goldLabelFr', 'goldAltFr']
+    values = [['Syndrome de Marfan', 'MFS',
+               'syndrome de Marfan', 'Syndrome de Marfan'],
+              ['Syndrome de Marfan', 'Syndrome de marfan',
+               'Maladie de Crohn', 'maladie de crohn']]
+    input_df = pd.DataFrame(values, columns=columns)
+    normalization.add_normalized_columns(input_df)
+
+    assert(input_df.loc[0, 'normGoldAltFr'] == '')
+    assert(input_df.loc[1, 'normAltFr'] == '')
+    assert(input_df.loc[1, 'normGoldAltFr'] == '')
+
+    output_df = scorer.Scorer(['jaro'], normalized=True).score(
+        input_df, output_dir=str(tmp_path))
+    # The gold label is found, the empty gold altLabel does not lower
+    # the score.
+    assert(output_df.loc[0, 'scoreJaroFrMean_best_label'] == 1)
+    # The empty altLabel and gold altLabel do not match each other.
+    assert(output_df.loc[1, 'scoreJaroFrMax_best_label'] < 1)
+    assert(output_df.loc[1, 'scoreJaroFrMean_best_label']
+           == output_df.loc[1, 'scoreJaroFrLabel'])
+
+
+def test_normalized_pairs(tmp_path):
+    """Test that the emptied altLabels are not counted as compared pairs."""
+    columns = ['labelFr', 'altFr', 'goldLabelFr', 'goldAltFr']
+    values = [['Marfan', 'marfan', 'Marfan', 'MARFAN']]
+    input_df = pd.DataFrame(values, columns=columns)
+    normalization.add_normalized_columns(input_df)
+
+    run_report = instrumentation.RunReport()
+    scorer.Scorer(['jaro'], run_report=run_report, normalized=True).score(
+        input_df, output_dir=str(tmp_path))
+    pairs = {stage['quality_metric']: stage['pairs']
+             for stage in run_report.stages if stage['name'] == 'score'}
+    assert(pairs == {'label': 1, 'best_label': 1, 'mean_best_label': 1,
+                     'max_best_label': 1})
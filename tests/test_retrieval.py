@@ -0,0 +1,44 @@
+"""Test class NgramIndex."""
+
+import pandas as pd
+
+from orphanet_translation import retrieval
+
+
+def test_query():
+    """Test the top-k entities returned by NgramIndex."""
+    columns = ['goldLabelEn', 'goldAltEn', 'goldLabelFr', 'goldAltFr']
+    values = [['cystic fibrosis', 'mucoviscidosis', 'mucoviscidose', ''],
+              ['marfan syndrome', '', 'syndrome de Marfan', ''],
+              ['fibrous dysplasia', 'fibrous dysplasia of bone', '', '']]
+    ordo_df = pd.DataFrame(values, columns=columns,
+                           index=['586', '558', '249'])
+    index = retrieval.NgramIndex(ordo_df)
+
+    results = index.query('Mucoviscidosis', 'en', k=2)
+    assert(results[0][0] == '586')
+
+    results = index.query('fibrosis', 'en', k=1)
+    assert(len(results) == 1)
+
+    results = index.query('syndrome de marfan', 'fr', metric='identity')
+    assert(results[0][0] == '558')
+    assert(index.query('xyz', 'fr') == [])
+
+    results = index.query('MUCOVISCIDOSE', 'fr', metric='jaro')
+    assert(results[0] == ('586', 1))
+
+
+def test_query_synonyms():
+    """Test that an entity with many synonyms takes a single candidate."""
+    columns = ['goldLabelEn', 'goldAltEn']
+    values = [['cystic fibrosis',
+               'cystic fibrosis of pancreas|cystic fibrosis type 1'],
+              ['cystic kidney', '']]
+    ordo_df = pd.DataFrame(values, columns=columns, index=['1', '2'])
+    index = retrieval.NgramIndex(ordo_df)
+
+    assert(list(index.candidates('cystic fibrosis', 'en', 2)) == [0, 1])
+    results = index.query('cystic fibrosis', 'en', k=2, nb_candidates=2)
+    assert([orpha_number for orpha_number, _ in results] == ['1', '2'])
+    assert(results[0][1] == 1)
@@ -0,0 +1,37 @@
+"""Test the score command."""
+
+import os
+
+import pandas as pd
+import pytest
+import textdistance
+
+from orphanet_translation import score
+from orphanet_translation.metrics import scorer
+
+
+def test_main(tmp_path):
+    """Test the score command on a merged DataFrame."""
+    columns = ['labelEn', 'altEn', 'goldLabelEn', 'goldAltEn']
+    values = [['test', 'test1|test2', 'test', 'test2|test1'],
+              ['disease', None, 'disease', 'flu']]
+    input_file = os.path.join(str(tmp_path), 'merged.json')
+    pd.DataFrame(values, columns=columns).to_json(input_file)
+    results_folder = os.path.join(str(tmp_path), 'results')
+
+    score.main(['--input', input_file, '--result_folder', results_folder,
+                '--metrics', 'identity'])
+
+    with open(os.path.join(results_folder, 'identity.txt')) as result_file:
+        lines = result_file.readlines()
+    assert(lines[2] == '\tlabel: 1.0\n')
+
+    with pytest.raises(SystemExit):
+        score.main(['--input', input_file, '--result_folder', results_folder,
+                    '--metrics', 'unknown'])
+
+
+def test_metrics_in_textdistance():
+    """Test that every accepted metric exists in textdistance."""
+    for metric in scorer.TEXTDISTANCE_FUNCTIONS:
+        assert(hasattr(textdistance, metric))